@@ -285,7 +285,7 @@ class Identity(types.SimpleNamespace):
         )
 
 
-class CalibIdentity(types.SimpleNamespace):
+class CalibIdentity:
     """Keyword-value pairs describing a calibration
 
     Parameters
@@ -306,15 +306,24 @@ class CalibIdentity(types.SimpleNamespace):
     headerKeywords = ("DATEOBS", "W_SPMOD", "W_ARM", "W_VISIT")
     """Corresponding header keywords to use"""
 
+    __slots__ = elements
+
     def __init__(self, obsDate, spectrograph, arm, visit0):
-        super().__init__(obsDate=obsDate, spectrograph=int(spectrograph), arm=arm, visit0=int(visit0))
+        self.obsDate = obsDate
+        self.spectrograph = int(spectrograph)
+        self.arm = arm
+        self.visit0 = int(visit0)
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__,
+                           ", ".join(f"{elem}={getattr(self, elem)!r}" for elem in self.elements))
 
     def __reduce__(self):
         """Support pickling"""
         return (self.__class__, (self.obsDate, self.spectrograph, self.arm, self.visit0))
 
     def __eq__(self, other):
-        for attr in ("obsDate", "spectrograph", "arm", "visit0"):
+        for attr in self.elements:
             if getattr(self, attr) != getattr(other, attr):
                 return False
         return True
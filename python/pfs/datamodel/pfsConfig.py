@@ -1166,12 +1166,12 @@ class PfsDesign:
         RuntimeError
             If a scalar ``fiberId`` is requested but not present.
         """
-        result = np.nonzero(np.isin(self.fiberId, fiberId))[0]
         if np.isscalar(fiberId):
+            result = np.flatnonzero(self.fiberId == fiberId)
             if result.size == 0:
                 raise RuntimeError(f"No fiber with fiberId={fiberId}")
             return result.item()
-        return result
+        return np.nonzero(np.isin(self.fiberId, fiberId))[0]
 
     def getIdentityFromIndex(self, index):
         """Return the identity of the target indicated by the index
@@ -1,5 +1,4 @@
 import os
-import re
 from types import SimpleNamespace
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Type
@@ -9,7 +8,7 @@ import numpy as np
 import astropy.io.fits
 from scipy.interpolate import CubicSpline
 
-from .utils import astropyHeaderFromDict, astropyHeaderToDict
+from .utils import astropyHeaderFromDict, astropyHeaderToDict, compileFilenameRegex
 from .identity import CalibIdentity
 
 __all__ = (
@@ -200,7 +199,7 @@ class PfsDetectorMap(ABC):
         filename : `str`
             Filename, without directory.
         """
-        return cls.filenameFormat % identity.getDict()
+        return cls.filenameFormat % identity.toDict()
 
     @classmethod
     def parseFilename(cls, path):
@@ -220,7 +219,7 @@ class PfsDetectorMap(ABC):
             Identity of the data of interest.
         """
         dirName, fileName = os.path.split(path)
-        matches = re.search(cls.filenameRegex, fileName)
+        matches = compileFilenameRegex(cls.filenameRegex).search(fileName)
         if not matches:
             raise RuntimeError("Unable to parse filename: %s" % (fileName,))
         identity = matches.groupdict()
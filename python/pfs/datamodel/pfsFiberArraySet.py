@@ -1,10 +1,9 @@
 import os
-import re
 from typing import Type
 
 import numpy as np
 
-from .utils import astropyHeaderToDict, astropyHeaderFromDict, inheritDocstrings
+from .utils import astropyHeaderToDict, astropyHeaderFromDict, compileFilenameRegex, inheritDocstrings
 from .masks import MaskHelper
 from .target import Target
 from .observations import Observations
@@ -220,7 +219,7 @@ class PfsFiberArraySet:
             Identity of the data of interest.
         """
         dirName, fileName = os.path.split(path)
-        matches = re.search(cls.filenameRegex, fileName)
+        matches = compileFilenameRegex(cls.filenameRegex).search(fileName)
         if not matches:
             raise RuntimeError("Unable to parse filename: %s" % (fileName,))
         return Identity.fromDict({kk: tt(vv) for (kk, tt), vv in zip(cls.filenameKeys, matches.groups())})
@@ -1,14 +1,106 @@
 import os
-import re
 
 import numpy as np
+import astropy.io.fits
 
-from .utils import astropyHeaderToDict, astropyHeaderFromDict, createHash
+from .utils import astropyHeaderToDict, astropyHeaderFromDict, compileFilenameRegex, createHash
 from .identity import CalibIdentity
 
 __all__ = ("PfsFiberProfiles",)
 
 
+class RaggedArray:
+    """A sequence of arrays of differing sizes, stored contiguously
+
+    The values of all the arrays are held in a single flat array, with
+    ``offsets`` marking where each array starts and ends. Element ``ii`` is a
+    view (not a copy) of ``data[offsets[ii]:offsets[ii + 1]]``, reshaped to
+    ``shapes[ii]``.
+
+    Like a `list`, this supports ``len``, indexing with an `int` or a
+    `slice` (the latter returns a `list` of views) and iteration. Assignment
+    of elements is not supported, nor are membership tests (``in``),
+    ``index`` and ``count``, because array elements can't be compared with
+    ``==``.
+
+    Parameters
+    ----------
+    data : `numpy.ndarray`, length ``L``
+        Flattened values of all arrays.
+    offsets : `numpy.ndarray` of `int`, length ``N + 1``
+        Index of the start of each array in ``data``, followed by ``L``.
+    shapes : `list` (length ``N``) of `tuple` of `int`
+        Shape of each array.
+    mask : `numpy.ndarray` of `bool`, length ``L``, optional
+        Flattened mask of all arrays. If provided, the elements are returned
+        as `numpy.ma.MaskedArray`.
+    """
+
+    def __init__(self, data, offsets, shapes, mask=None):
+        self.data = data
+        self.offsets = offsets
+        self.shapes = shapes
+        self.mask = mask
+
+    @classmethod
+    def fromArrays(cls, arrays, masked=False, dtype=None):
+        """Construct from a list of arrays
+
+        Parameters
+        ----------
+        arrays : iterable of array_like
+            Arrays to store.
+        masked : `bool`, optional
+            Retain the masks of the arrays (an absent mask is treated as all
+            `False`)?
+        dtype : `numpy.dtype`, optional
+            Data type for the values; by default, that of the arrays.
+
+        Returns
+        -------
+        self : `RaggedArray`
+            Arrays stored contiguously.
+        """
+        arrays = [np.ma.asarray(aa, dtype=dtype) if masked else np.asarray(aa, dtype=dtype) for aa in arrays]
+        offsets = np.zeros(len(arrays) + 1, dtype=int)
+        np.cumsum([aa.size for aa in arrays], out=offsets[1:])
+        shapes = [aa.shape for aa in arrays]
+        if not arrays:
+            mask = np.array([], dtype=bool) if masked else None
+            return cls(np.array([], dtype=dtype), offsets, shapes, mask)
+        data = np.concatenate([np.ma.getdata(aa).ravel() for aa in arrays])
+        mask = np.concatenate([np.ma.getmaskarray(aa).ravel() for aa in arrays]) if masked else None
+        return cls(data, offsets, shapes, mask)
+
+    def __len__(self):
+        """Return number of arrays"""
+        return len(self.shapes)
+
+    def __iter__(self):
+        """Iterate over views of the arrays"""
+        for ii in range(len(self)):
+            yield self[ii]
+
+    def __contains__(self, value):
+        """Membership is not supported"""
+        raise TypeError(f"{self.__class__.__name__} does not support membership tests")
+
+    def __getitem__(self, index):
+        """Return a view of a single array, or a list of views for a slice"""
+        if isinstance(index, slice):
+            return [self[ii] for ii in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError(f"Index {index} out of range for {len(self)} arrays")
+        select = slice(self.offsets[index], self.offsets[index + 1])
+        shape = self.shapes[index]
+        values = self.data[select].reshape(shape)
+        if self.mask is None:
+            return values
+        return np.ma.masked_array(values, mask=self.mask[select].reshape(shape))
+
+
 class PfsFiberProfiles:
     """The shape of the fiber trace as a function of detector row
 
@@ -16,6 +108,19 @@ class PfsFiberProfiles:
     various positions up the trace. The profile for a fiber for a particular row
     can be obtained by iterpolating between these.
 
+    The ``rows``, ``profiles`` and ``norm`` are each stored contiguously as a
+    `RaggedArray`, the elements of which are views into a single flat array.
+    These support indexing and iteration like a `list`, but not assignment:
+    ``profiles.profiles[ii] = values`` raises `TypeError`. Writing to the
+    elements (e.g., ``profiles.profiles[ii][jj] = values``, or to the
+    ``mask`` of a profile) modifies the stored values.
+
+    The ``fiberId``, ``radius`` and ``oversample`` are not copied if they are
+    already `numpy.ndarray`, so they are shared with the caller: modifying
+    the caller's array modifies this object. The ``rows``, ``profiles`` and
+    ``norm`` are copied into contiguous storage, unless they are provided as
+    a `RaggedArray` (which is used as-is).
+
     Parameters
     ----------
     identity : `pfs.datamodel.CalibIdentity`
@@ -35,7 +140,8 @@ class PfsFiberProfiles:
         Empirical profiles for each fiber. ``M`` is the number of profiles for
         that fiber. ``P = int(2*(radius + 1)*oversample) + 1``. The
         profile arrays may be of type `numpy.ma.masked_array`, in order to
-        indicate profile values that should be ignored.
+        indicate profile values that should be ignored. The profiles are
+        stored as `float32`.
     norm : iterable (length ``N``) of array_like of `float32` (length ``Q``)
         Normalisation to apply when extracting spectrum from the image. ``Q``
         is the height of the detector; or it may be ``0`` if no normalisation
@@ -59,12 +165,13 @@ class PfsFiberProfiles:
 
     def __init__(self, identity, fiberId, radius, oversample, rows, profiles, norm, metadata):
         self.identity = identity
-        self.fiberId = np.array(fiberId)
-        self.radius = np.array(radius)
-        self.oversample = np.array(oversample)
-        self.rows = [np.array(rr) for rr in rows]
-        self.profiles = [np.ma.masked_array(pp) for pp in profiles]
-        self.norm = [np.array(nn) for nn in norm]
+        self.fiberId = np.asarray(fiberId)
+        self.radius = np.asarray(radius)
+        self.oversample = np.asarray(oversample)
+        self.rows = rows if isinstance(rows, RaggedArray) else RaggedArray.fromArrays(rows)
+        self.profiles = (profiles if isinstance(profiles, RaggedArray) else
+                         RaggedArray.fromArrays(profiles, masked=True, dtype=np.float32))
+        self.norm = norm if isinstance(norm, RaggedArray) else RaggedArray.fromArrays(norm)
         self.metadata = metadata
 
         self.length = len(fiberId)
@@ -77,9 +184,17 @@ class PfsFiberProfiles:
         assert self.oversample.shape == (self.length,)
         assert len(self.rows) == self.length
         assert len(self.profiles) == self.length
-        assert all(len(rr) == len(pp) for rr, pp in zip(self.rows, self.profiles))
-        for prof, rad, samp in zip(self.profiles, self.radius, self.oversample):
-            assert all(len(pp) == int(2*(rad + 1)*samp) + 1 for pp in prof)
+        numRows = np.array([shape[0] for shape in self.rows.shapes], dtype=int)
+        numProfiles = np.array([shape[0] for shape in self.profiles.shapes], dtype=int)
+        assert np.array_equal(numRows, numProfiles)
+        expected = (2*(self.radius + 1)*self.oversample).astype(int) + 1
+        for ii, (shape, num) in enumerate(zip(self.profiles.shapes, expected)):
+            if len(shape) == 2:
+                # Profiles for the fiber are an (M,P) array, so all have the same length
+                good = shape[1] == num
+            else:
+                good = all(len(pp) == num for pp in self.profiles[ii])
+            assert good, f"Profile length mismatch for fiberId={self.fiberId[ii]}"
         assert len(self.norm) == self.length
 
     def __len__(self):
@@ -115,7 +230,11 @@ class PfsFiberProfiles:
         """
         values = [self.identity]
         values += [getattr(self, attr).tobytes() for attr in ("fiberId", "radius", "oversample")]
-        values += [tuple(xx.tobytes() for xx in getattr(self, attr)) for attr in ("rows", "profiles", "norm")]
+        values.append(tuple(xx.tobytes() for xx in self.rows))
+        # Profiles are hashed as float64 (as they were held before being stored as float32), so that the
+        # hash matches that recorded in existing products (e.g., PfsFiberNorms).
+        values.append(tuple(xx.astype(np.float64).tobytes() for xx in self.profiles))
+        values.append(tuple(xx.tobytes() for xx in self.norm))
         return createHash(values)
 
     @property
@@ -137,7 +256,7 @@ class PfsFiberProfiles:
         filename : `str`
             Filename, without directory.
         """
-        return cls.filenameFormat % identity.getDict()
+        return cls.filenameFormat % identity.toDict()
 
     @classmethod
     def parseFilename(cls, path):
@@ -157,7 +276,7 @@ class PfsFiberProfiles:
             Identity of the data of interest.
         """
         dirName, fileName = os.path.split(path)
-        matches = re.search(cls.filenameRegex, fileName)
+        matches = compileFilenameRegex(cls.filenameRegex).search(fileName)
         if not matches:
             raise RuntimeError("Unable to parse filename: %s" % (fileName,))
         return CalibIdentity.fromDict(matches.groupdict())
@@ -184,25 +303,52 @@ class PfsFiberProfiles:
         fiberId1 = hdu.data["fiberId"].astype(np.int32)
         radius = hdu.data["radius"].astype(np.int32)
         oversample = hdu.data["oversample"].astype(float)
-        norm = [nn.astype(np.float32) for nn in hdu.data["norm"]]
+        normColumn = hdu.data["norm"]
+        normOffsets = np.zeros(len(normColumn) + 1, dtype=int)
+        np.cumsum([len(nn) for nn in normColumn], out=normOffsets[1:])
+        normData = np.empty(normOffsets[-1], dtype=np.float32)
+        for nn, start, stop in zip(normColumn, normOffsets[:-1], normOffsets[1:]):
+            normData[start:stop] = nn
+        norm = RaggedArray(normData, normOffsets, [(size,) for size in np.diff(normOffsets).tolist()])
 
         hdu = fits["PROFILES"]
         fiberId2 = hdu.data["fiberId"].astype(np.int32)
-        rows = hdu.data["rows"].astype(float)
         profiles = hdu.data["profiles"]
         masks = hdu.data["masks"]
 
-        numFibers = len(fiberId1)
-        fiberRows = []
-        fiberProfiles = []
-        for ii in range(numFibers):
-            select = fiberId2 == fiberId1[ii]
-            fiberRows.append(rows[select])
-            fiberProfiles.append(np.ma.masked_array(np.array(profiles[select].tolist(), dtype=float),
-                                                    mask=(np.array(masks[select].tolist(), dtype=bool) if
-                                                          masks[select].size > 0 else False)))
-
-        return cls(identity, fiberId1, radius, oversample, fiberRows, fiberProfiles, norm, metadata)
+        # Indices of the profiles for each fiberId, in their original order
+        order = np.argsort(fiberId2, kind="stable")
+        uniqueId, start = np.unique(fiberId2[order], return_index=True)
+        indexByFiber = dict(zip(uniqueId.tolist(), np.split(order, start[1:])))
+        noIndex = np.array([], dtype=int)
+        select = [indexByFiber.get(ff, noIndex) for ff in fiberId1.tolist()]
+        numProfiles = np.array([len(ss) for ss in select], dtype=int)
+        select = np.concatenate(select) if select else noIndex
+
+        rowOffsets = np.zeros(len(fiberId1) + 1, dtype=int)
+        np.cumsum(numProfiles, out=rowOffsets[1:])
+        rows = RaggedArray(hdu.data["rows"][select].astype(float), rowOffsets,
+                           [(num,) for num in numProfiles.tolist()])
+
+        # Copy each profile (and mask) straight into the contiguous storage
+        profileOffsets = np.zeros(len(select) + 1, dtype=int)
+        np.cumsum([len(profiles[ii]) for ii in select], out=profileOffsets[1:])
+        data = np.empty(profileOffsets[-1], dtype=np.float32)
+        mask = np.zeros(profileOffsets[-1], dtype=bool)
+        for ii, start, stop in zip(select, profileOffsets[:-1], profileOffsets[1:]):
+            data[start:stop] = profiles[ii]
+            if masks[ii].size > 0:  # Profiles written without a mask have an empty mask array
+                mask[start:stop] = masks[ii]
+
+        offsets = profileOffsets[rowOffsets]
+        width = np.diff(offsets)//np.maximum(numProfiles, 1)
+        sizes = np.diff(profileOffsets)
+        if not np.array_equal(sizes, np.repeat(width, numProfiles)):
+            raise RuntimeError("Profiles for a fiber have differing lengths")
+        shapes = [(num, ww) if num > 0 else (0,) for num, ww in zip(numProfiles.tolist(), width.tolist())]
+        fiberProfiles = RaggedArray(data, offsets, shapes, mask)
+
+        return cls(identity, fiberId1, radius, oversample, rows, fiberProfiles, norm, metadata)
 
     @classmethod
     def readFits(cls, filename):
@@ -221,8 +367,7 @@ class PfsFiberProfiles:
         self : ``cls``
             Constructed instance, from FITS file.
         """
-        import astropy.io.fits
-        with astropy.io.fits.open(filename) as fits:
+        with astropy.io.fits.open(filename, memmap=True, lazy_load_hdus=True, cache=False) as fits:
             try:
                 identity = CalibIdentity.fromHeader(fits[0].header)
             except KeyError:
@@ -250,9 +395,8 @@ class PfsFiberProfiles:
         self : `PfsFiberArraySet`
             Spectra read from file.
         """
-        import astropy.io.fits
         filename = os.path.join(dirName, cls.getFilename(identity))
-        with astropy.io.fits.open(filename) as fits:
+        with astropy.io.fits.open(filename, memmap=True, lazy_load_hdus=True, cache=False) as fits:
             return cls._readImpl(fits, identity)
 
     def writeFits(self, filename):
@@ -295,7 +439,6 @@ class PfsFiberProfiles:
         # NOTE: When making any changes to this method that modify the output
         # format, increment the DAMD_VER header value and record the change in
         # the versions.txt file.
-        import astropy.io.fits
         header = self.metadata.copy()
         header.update(self.identity.toHeader())
         header = astropyHeaderFromDict(header)
@@ -307,30 +450,20 @@ class PfsFiberProfiles:
             astropy.io.fits.Column("fiberId", format="J", array=self.fiberId),
             astropy.io.fits.Column("radius", format="J", array=self.radius),
             astropy.io.fits.Column("oversample", format="D", array=self.oversample),
-            astropy.io.fits.Column("norm", format="PE()", array=self.norm),
+            astropy.io.fits.Column("norm", format="PE()", array=list(self.norm)),
         ], name="FIBERS")
         fibersHdu.header["INHERIT"] = True
 
-        # Concatenate the 'rows' and 'profiles' (and split 'profiles' into data+mask)
-        numProfiles = sum(len(rr) for rr in self.rows)
-        fiberId = np.zeros(numProfiles, dtype=int)
-        rows = np.zeros(numProfiles, dtype=float)
-        profiles = []
-        masks = []
-        start = 0
-        for ii in range(self.length):
-            num = len(self.rows[ii])
-            prof = self.profiles[ii]
-            fiberId[start:start + num] = self.fiberId[ii]
-            rows[start:start + num] = self.rows[ii]
-            for pp in prof:
-                if isinstance(pp, np.ma.MaskedArray):
-                    profiles.append(pp.data)
-                    masks.append(np.ones_like(pp.data, dtype=bool) & pp.mask)  # Avoids games with type/shape
-                else:
-                    profiles.append(pp)
-                    masks.append([])
-            start += num
+        # The 'rows' are already concatenated; split the contiguous 'profiles' (and mask) by profile
+        numProfiles = np.array([shape[0] for shape in self.profiles.shapes], dtype=int)
+        fiberId = np.repeat(self.fiberId, numProfiles)
+        rows = self.rows.data
+        firstProfile = np.repeat(np.cumsum(numProfiles) - numProfiles, numProfiles)
+        profileSize = np.repeat(np.diff(self.profiles.offsets)//np.maximum(numProfiles, 1), numProfiles)
+        start = np.repeat(self.profiles.offsets[:-1], numProfiles)
+        start += (np.arange(numProfiles.sum()) - firstProfile)*profileSize
+        profiles = np.split(self.profiles.data, start[1:]) if start.size > 0 else []
+        masks = np.split(self.profiles.mask, start[1:]) if start.size > 0 else []
 
         profilesHdu = astropy.io.fits.BinTableHDU.from_columns([
             astropy.io.fits.Column("fiberId", format="J", array=fiberId),
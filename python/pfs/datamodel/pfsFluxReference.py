@@ -1,8 +1,7 @@
 import os
-import re
 import numpy as np
 
-from .utils import astropyHeaderToDict, astropyHeaderFromDict
+from .utils import astropyHeaderToDict, astropyHeaderFromDict, compileFilenameRegex
 from .masks import MaskHelper
 from .target import Target
 from .identity import Identity
@@ -161,7 +160,7 @@ class PfsFluxReference:
             Identity of the data of interest.
         """
         dirName, fileName = os.path.split(path)
-        matches = re.search(cls.filenameRegex, fileName)
+        matches = compileFilenameRegex(cls.filenameRegex).search(fileName)
         if not matches:
             raise RuntimeError("Unable to parse filename: %s" % (fileName,))
         return Identity.fromDict({kk: tt(vv) for (kk, tt), vv in zip(cls.filenameKeys, matches.groups())})
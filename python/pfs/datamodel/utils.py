@@ -4,6 +4,7 @@
 import hashlib
 import inspect
 import functools
+import re
 from typing import Optional, Set, Type, TypeVar, Union
 from logging import Logger
 import datetime
@@ -239,6 +240,26 @@ def inheritDocstrings(cls):
     return cls
 
 
+@functools.lru_cache(maxsize=None)
+def compileFilenameRegex(regex):
+    """Compile a filename regex, caching the result
+
+    Filename regexes are class attributes, so there are only a handful of
+    them; unlike the `re` module's own cache, this never evicts them.
+
+    Parameters
+    ----------
+    regex : `str`
+        Regular expression to compile.
+
+    Returns
+    -------
+    compiled : `re.Pattern`
+        Compiled regular expression.
+    """
+    return re.compile(regex)
+
+
 def combineArms(arms):
     """Combine and order input arm identifications
 
@@ -0,0 +1,83 @@
+import pickle
+import sys
+import unittest
+
+import lsst.utils.tests
+
+from pfs.datamodel.identity import CalibIdentity
+
+
+class CalibIdentityTestCase(lsst.utils.tests.TestCase):
+    """Test for CalibIdentity"""
+    def setUp(self):
+        self.obsDate = "2024-04-15"
+        self.spectrograph = 3
+        self.arm = "n"
+        self.visit0 = 12345
+        self.identity = CalibIdentity(self.obsDate, self.spectrograph, self.arm, self.visit0)
+
+    def testBasic(self):
+        """Test construction and attribute access"""
+        identity = CalibIdentity(self.obsDate, str(self.spectrograph), self.arm, str(self.visit0))
+        self.assertEqual(identity.obsDate, self.obsDate)
+        self.assertEqual(identity.spectrograph, self.spectrograph)
+        self.assertEqual(identity.arm, self.arm)
+        self.assertEqual(identity.visit0, self.visit0)
+        self.assertIsInstance(identity.spectrograph, int)
+        self.assertIsInstance(identity.visit0, int)
+        with self.assertRaises(AttributeError):
+            identity.foo = "bar"
+
+    def testRepr(self):
+        """Test __repr__"""
+        self.assertEqual(repr(self.identity),
+                         "CalibIdentity(obsDate='2024-04-15', spectrograph=3, arm='n', visit0=12345)")
+
+    def testEquality(self):
+        """Test __eq__ and __hash__"""
+        other = CalibIdentity(self.obsDate, self.spectrograph, self.arm, self.visit0)
+        self.assertEqual(other, self.identity)
+        self.assertEqual(hash(other), hash(self.identity))
+        for name, value in (("obsDate", "2024-04-16"), ("spectrograph", 4), ("arm", "r"), ("visit0", 54321)):
+            kwargs = self.identity.toDict()
+            kwargs[name] = value
+            different = CalibIdentity(**kwargs)
+            self.assertNotEqual(different, self.identity)
+            self.assertNotEqual(hash(different), hash(self.identity))
+
+    def testPickle(self):
+        """Test pickling with __reduce__"""
+        copy = pickle.loads(pickle.dumps(self.identity))
+        self.assertEqual(copy, self.identity)
+        self.assertEqual(hash(copy), hash(self.identity))
+
+    def testDict(self):
+        """Test toDict and fromDict"""
+        self.assertEqual(CalibIdentity.fromDict(self.identity.toDict()), self.identity)
+        dataId = dict(dateObs=self.obsDate, spectrograph=self.spectrograph, arm=self.arm, visit=self.visit0)
+        self.assertEqual(CalibIdentity.fromDict(dataId), self.identity)
+
+        # toDict follows changes to the attributes
+        self.identity.visit0 = 54321
+        self.assertEqual(self.identity.toDict()["visit0"], 54321)
+        self.assertEqual(self.identity.toHeader()["W_VISIT"], 54321)
+
+    def testHeader(self):
+        """Test toHeader and fromHeader"""
+        header = self.identity.toHeader()
+        self.assertEqual(header, dict(DATEOBS=self.obsDate, W_SPMOD=self.spectrograph, W_ARM=self.arm,
+                                      W_VISIT=self.visit0))
+        self.assertEqual(CalibIdentity.fromHeader(header), self.identity)
+
+
+class TestMemory(lsst.utils.tests.MemoryTestCase):
+    pass
+
+
+def setup_module(module):
+    lsst.utils.tests.init()
+
+
+if __name__ == "__main__":
+    setup_module(sys.modules["__main__"])
+    unittest.main()
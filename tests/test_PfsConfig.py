@@ -54,17 +54,21 @@ class PfsConfigTestCase(lsst.utils.tests.TestCase):
         self.fiberId = np.array(list(reversed(range(self.numFibers))))
         rng = np.random.RandomState(12345)
         self.tract = rng.uniform(high=30000, size=self.numFibers).astype(int)
-        self.patch = ["%d,%d" % tuple(xy.tolist()) for
-                      xy in rng.uniform(high=15, size=(self.numFibers, 2)).astype(int)]
+        xy = rng.uniform(high=15, size=(self.numFibers, 2)).astype(int)
+        self.patch = np.char.add(np.char.add(xy[:, 0].astype(str), ","), xy[:, 1].astype(str)).tolist()
 
-        boresight = lsst.geom.SpherePoint(self.raBoresight*lsst.geom.degrees,
-                                          self.decBoresight*lsst.geom.degrees)
         radius = np.sqrt(rng.uniform(size=self.numFibers))*0.5*self.fov.asDegrees()  # degrees
-        theta = rng.uniform(size=self.numFibers)*2*np.pi  # radians
-        coords = [boresight.offset(tt*lsst.geom.radians, rr*lsst.geom.degrees) for
-                  rr, tt in zip(radius, theta)]
-        self.ra = np.array([cc.getRa().asDegrees() for cc in coords])
-        self.dec = np.array([cc.getDec().asDegrees() for cc in coords])
+        theta = rng.uniform(size=self.numFibers)*2*np.pi  # radians; bearing from east towards north
+        # Offset from the boresight, equivalent to lsst.geom.SpherePoint.offset
+        sinRadius = np.sin(np.radians(radius))
+        cosRadius = np.cos(np.radians(radius))
+        sinDec0 = np.sin(np.radians(self.decBoresight))
+        cosDec0 = np.cos(np.radians(self.decBoresight))
+        dec = np.arcsin(sinDec0*cosRadius + cosDec0*sinRadius*np.sin(theta))
+        ra = np.radians(self.raBoresight) + np.arctan2(np.cos(theta)*sinRadius*cosDec0,
+                                                       cosRadius - sinDec0*np.sin(dec))
+        self.ra = np.degrees(ra) % 360.0
+        self.dec = np.degrees(dec)
         self.pfiNominal = (self.pfiScale*np.array([(rr*np.cos(tt), rr*np.sin(tt)) for
                                                    rr, tt in zip(radius, theta)])).astype(np.float32)
         self.pfiCenter = (self.pfiNominal +
@@ -73,19 +77,31 @@ class PfsConfigTestCase(lsst.utils.tests.TestCase):
         self.catId = rng.uniform(high=23, size=self.numFibers).astype(int)
         self.objId = rng.uniform(high=2**63, size=self.numFibers).astype(int)
 
-        self.targetType = np.array([int(TargetType.SKY)]*self.numSky +
-                                   [int(TargetType.FLUXSTD)]*self.numFluxStd +
-                                   [int(TargetType.SCIENCE)]*self.numObject +
-                                   [int(TargetType.UNASSIGNED)]*self.numUnassigned +
-                                   [int(TargetType.ENGINEERING)]*self.numEngineering +
-                                   [int(TargetType.SUNSS_DIFFUSE)]*self.numSuNSS_Diffuse +
-                                   [int(TargetType.SUNSS_IMAGING)]*self.numSuNSS_Imaging)
+        self.targetType = np.repeat([int(TargetType.SKY),
+                                     int(TargetType.FLUXSTD),
+                                     int(TargetType.SCIENCE),
+                                     int(TargetType.UNASSIGNED),
+                                     int(TargetType.ENGINEERING),
+                                     int(TargetType.SUNSS_DIFFUSE),
+                                     int(TargetType.SUNSS_IMAGING)],
+                                    [self.numSky,
+                                     self.numFluxStd,
+                                     self.numObject,
+                                     self.numUnassigned,
+                                     self.numEngineering,
+                                     self.numSuNSS_Diffuse,
+                                     self.numSuNSS_Imaging])
         rng.shuffle(self.targetType)
-        self.fiberStatus = np.array([int(FiberStatus.BROKENFIBER)]*self.numBroken +
-                                    [int(FiberStatus.BLOCKED)]*self.numBlocked +
-                                    [int(FiberStatus.BLACKSPOT)]*self.numBlackSpot +
-                                    [int(FiberStatus.UNILLUMINATED)]*self.numUnilluminated +
-                                    [int(FiberStatus.GOOD)]*self.numGood)
+        self.fiberStatus = np.repeat([int(FiberStatus.BROKENFIBER),
+                                      int(FiberStatus.BLOCKED),
+                                      int(FiberStatus.BLACKSPOT),
+                                      int(FiberStatus.UNILLUMINATED),
+                                      int(FiberStatus.GOOD)],
+                                     [self.numBroken,
+                                      self.numBlocked,
+                                      self.numBlackSpot,
+                                      self.numUnilluminated,
+                                      self.numGood])
         rng.shuffle(self.fiberStatus)
 
         self.epoch = np.full(self.numFibers, "J2000.0")
@@ -99,25 +115,25 @@ class PfsConfigTestCase(lsst.utils.tests.TestCase):
         fiberMagnitude = [22.0, 23.5, 25.0, 26.0]
         fiberFluxes = [(f * u.ABmag).to_value(u.nJy) for f in fiberMagnitude]
 
-        self.fiberFlux = [np.array(fiberFluxes if
-                                   tt in (TargetType.SCIENCE, TargetType.FLUXSTD) else [])
-                          for tt in self.targetType]
+        # Only SCIENCE and FLUXSTD fibers get photometry; share the same arrays between them
+        hasFlux = np.isin(self.targetType, [int(TargetType.SCIENCE), int(TargetType.FLUXSTD)])
+        noFlux = np.array([], dtype=float)
+        fiberFluxes = np.asarray(fiberFluxes)
+        self.fiberFlux = [fiberFluxes if hf else noFlux for hf in hasFlux]
 
         # For these tests, assign psfFlux and totalFlux
         # the same value as the fiber flux
-        self.psfFlux = [fFlux for fFlux in self.fiberFlux]
-        self.totalFlux = [fFlux for fFlux in self.fiberFlux]
+        self.psfFlux = self.fiberFlux.copy()
+        self.totalFlux = self.fiberFlux.copy()
 
         # Assign corresponding errors as 1% of fiberFlux
-        fluxError = [0.01 * f for f in fiberFluxes]
-        self.fiberFluxErr = [np.array(fluxError if
-                                      tt in (TargetType.SCIENCE, TargetType.FLUXSTD) else [])
-                             for tt in self.targetType]
-        self.psfFluxErr = [e for e in self.fiberFluxErr]
-        self.totalFluxErr = [e for e in self.fiberFluxErr]
-
-        self.filterNames = [["g", "i", "y", "H"] if tt in (TargetType.SCIENCE, TargetType.FLUXSTD) else []
-                            for tt in self.targetType]
+        fluxError = 0.01*fiberFluxes
+        self.fiberFluxErr = [fluxError if hf else noFlux for hf in hasFlux]
+        self.psfFluxErr = self.fiberFluxErr.copy()
+        self.totalFluxErr = self.fiberFluxErr.copy()
+
+        filterNames = ["g", "i", "y", "H"]
+        self.filterNames = [filterNames if hf else [] for hf in hasFlux]
 
         self.guideStars = GuideStars.empty()
 
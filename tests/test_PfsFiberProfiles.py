@@ -0,0 +1,223 @@
+import sys
+import unittest
+
+import numpy as np
+import astropy.io.fits
+
+import lsst.utils.tests
+
+from pfs.datamodel.identity import CalibIdentity
+from pfs.datamodel.pfsFiberProfiles import PfsFiberProfiles, RaggedArray
+
+
+class RaggedArrayTestCase(lsst.utils.tests.TestCase):
+    """Test for RaggedArray"""
+    def setUp(self):
+        self.arrays = [np.arange(3, dtype=float), np.array([], dtype=float), np.arange(10, 15, dtype=float)]
+        self.ragged = RaggedArray.fromArrays(self.arrays)
+
+    def testIndexing(self):
+        """Test indexing with positive, negative and numpy integer indices"""
+        self.assertEqual(len(self.ragged), len(self.arrays))
+        for ii, array in enumerate(self.arrays):
+            self.assertFloatsEqual(self.ragged[ii], array)
+            self.assertFloatsEqual(self.ragged[np.int64(ii)], array)
+            self.assertFloatsEqual(self.ragged[ii - len(self.arrays)], array)
+        with self.assertRaises(IndexError):
+            self.ragged[len(self.arrays)]
+        with self.assertRaises(IndexError):
+            self.ragged[-len(self.arrays) - 1]
+
+    def testSlice(self):
+        """Test indexing with a slice"""
+        for select in (slice(1, None), slice(None, None, -1), slice(0, 3, 2)):
+            result = self.ragged[select]
+            expected = self.arrays[select]
+            self.assertEqual(len(result), len(expected))
+            for rr, ee in zip(result, expected):
+                self.assertFloatsEqual(rr, ee)
+
+    def testIteration(self):
+        """Test iteration"""
+        self.assertEqual(len(list(self.ragged)), len(self.arrays))
+        for rr, ee in zip(self.ragged, self.arrays):
+            self.assertFloatsEqual(rr, ee)
+
+    def testUnsupported(self):
+        """Test that list operations relying on element comparison fail clearly"""
+        with self.assertRaises(TypeError):
+            self.arrays[0] in self.ragged
+        self.assertFalse(hasattr(self.ragged, "index"))
+        self.assertFalse(hasattr(self.ragged, "count"))
+
+    def testViews(self):
+        """Test that elements are views into the flat storage, and are masked"""
+        data = np.arange(6, dtype=float).reshape(2, 3)
+        ragged = RaggedArray.fromArrays([np.ma.masked_array(data, mask=data > 3), np.zeros((0, 3))],
+                                        masked=True)
+        element = ragged[0]
+        self.assertIsInstance(element, np.ma.MaskedArray)
+        self.assertEqual(element.shape, (2, 3))
+        self.assertFloatsEqual(element.mask, data > 3)
+        element[0, 0] = 123.0
+        self.assertEqual(ragged.data[0], 123.0)
+        with self.assertRaises(TypeError):
+            ragged[0] = data
+
+
+class PfsFiberProfilesTestCase(lsst.utils.tests.TestCase):
+    """Test for PfsFiberProfiles"""
+    def setUp(self):
+        self.rng = np.random.RandomState(12345)
+        self.identity = CalibIdentity(visit0=12345, arm="r", spectrograph=1, obsDate="2024-04-15")
+        self.fiberId = np.array([7, 3, 11, 5], dtype=np.int32)  # Deliberately not sorted
+        self.radius = np.array([2, 3, 2, 4], dtype=np.int32)
+        self.oversample = np.array([5.0, 5.0, 7.5, 10.0])
+        self.numProfiles = [3, 0, 1, 4]  # Includes a fiber with no profiles
+        self.height = 20
+        self.rows = []
+        self.profiles = []
+        self.norm = []
+        for ii, num in enumerate(self.numProfiles):
+            width = int(2*(self.radius[ii] + 1)*self.oversample[ii]) + 1
+            self.rows.append(self.rng.uniform(high=self.height, size=num))
+            profiles = self.rng.normal(size=(num, width)).astype(np.float32)
+            if ii % 2 == 0:
+                profiles = np.ma.masked_array(profiles, mask=self.rng.uniform(size=(num, width)) < 0.2)
+            self.profiles.append(profiles)
+            self.norm.append(self.rng.uniform(size=self.height if ii != 2 else 0).astype(np.float32))
+        self.metadata = dict(FOO=12345, BAR=0.9876)
+        self.fiberProfiles = self.makeFiberProfiles()
+
+    def makeFiberProfiles(self, **kwargs):
+        """Construct a PfsFiberProfiles from the default values
+
+        Parameters
+        ----------
+        **kwargs
+            Values to use instead of the defaults.
+
+        Returns
+        -------
+        fiberProfiles : `PfsFiberProfiles`
+            Fiber profiles.
+        """
+        args = dict(identity=self.identity, fiberId=self.fiberId, radius=self.radius,
+                    oversample=self.oversample, rows=self.rows, profiles=self.profiles, norm=self.norm,
+                    metadata=self.metadata)
+        args.update(kwargs)
+        return PfsFiberProfiles(**args)
+
+    def assertFiberProfiles(self, fiberProfiles):
+        """Assert that fiber profiles match the default values
+
+        Parameters
+        ----------
+        fiberProfiles : `PfsFiberProfiles`
+            Fiber profiles to check.
+        """
+        self.assertEqual(len(fiberProfiles), len(self.fiberId))
+        self.assertEqual(fiberProfiles.identity, self.identity)
+        self.assertFloatsEqual(fiberProfiles.fiberId, self.fiberId)
+        self.assertFloatsEqual(fiberProfiles.radius, self.radius)
+        self.assertFloatsEqual(fiberProfiles.oversample, self.oversample)
+        for ii, num in enumerate(self.numProfiles):
+            self.assertFloatsEqual(fiberProfiles.rows[ii], self.rows[ii])
+            self.assertFloatsEqual(fiberProfiles.norm[ii], self.norm[ii])
+            profiles = fiberProfiles.profiles[ii]
+            self.assertIsInstance(profiles, np.ma.MaskedArray)
+            self.assertEqual(len(profiles), num)
+            if num > 0:
+                self.assertFloatsEqual(profiles.data, np.ma.getdata(self.profiles[ii]))
+                self.assertFloatsEqual(np.ma.getmaskarray(profiles), np.ma.getmaskarray(self.profiles[ii]))
+
+    def testBasic(self):
+        """Test construction"""
+        self.assertFiberProfiles(self.fiberProfiles)
+        self.assertEqual(self.fiberProfiles, self.makeFiberProfiles())
+
+    def testIo(self):
+        """Test I/O
+
+        Tests that we can round-trip through FITS with the "writeFits" and
+        "readFits" methods.
+        """
+        with lsst.utils.tests.getTempFilePath(".fits") as filename:
+            self.fiberProfiles.writeFits(filename)
+            fiberProfiles = PfsFiberProfiles.readFits(filename)
+        self.assertFiberProfiles(fiberProfiles)
+        self.assertEqual(fiberProfiles.hash, self.fiberProfiles.hash)
+        for kk, vv in self.metadata.items():
+            self.assertEqual(fiberProfiles.metadata[kk], vv)
+
+    def testReadWithoutMasks(self):
+        """Test reading a file with profiles written without masks
+
+        Older files have an empty mask array for each profile.
+        """
+        fits = self.fiberProfiles._writeImpl()
+        profiles = fits["PROFILES"].data
+        numRows = len(profiles)
+        fits["PROFILES"] = astropy.io.fits.BinTableHDU.from_columns([
+            astropy.io.fits.Column("fiberId", format="J", array=profiles["fiberId"]),
+            astropy.io.fits.Column("rows", format="D", array=profiles["rows"]),
+            astropy.io.fits.Column("profiles", format="PD()", array=profiles["profiles"]),
+            astropy.io.fits.Column("masks", format="PL()", array=[np.array([], dtype=bool)]*numRows),
+        ], name="PROFILES")
+        with lsst.utils.tests.getTempFilePath(".fits") as filename:
+            fits.writeto(filename)
+            fiberProfiles = PfsFiberProfiles.readFits(filename)
+
+        for ii, num in enumerate(self.numProfiles):
+            profiles = fiberProfiles.profiles[ii]
+            self.assertIsInstance(profiles, np.ma.MaskedArray)
+            self.assertEqual(len(profiles), num)
+            self.assertFalse(np.any(np.ma.getmaskarray(profiles)))
+            if num > 0:
+                self.assertFloatsEqual(profiles.data, np.ma.getdata(self.profiles[ii]))
+
+    def testHash(self):
+        """Test that the hash is unchanged from that of older versions
+
+        Products such as PfsFiberNorms record the hash of the fiber profiles,
+        so it must not change with how the profiles are held in memory.
+        """
+        # Hash of these data, written and read by the datamodel before profiles were held as float32
+        expectHash = 6416807625366144285
+        with lsst.utils.tests.getTempFilePath(".fits") as filename:
+            self.fiberProfiles.writeFits(filename)
+            fiberProfiles = PfsFiberProfiles.readFits(filename)
+        self.assertEqual(fiberProfiles.hash, expectHash)
+
+    def testFilename(self):
+        """Test getFilename and parseFilename"""
+        filename = self.fiberProfiles.filename
+        self.assertEqual(filename, "pfsFiberProfiles-2024-04-15-012345-r1.fits")
+        self.assertEqual(PfsFiberProfiles.parseFilename("/path/to/" + filename), self.identity)
+        with self.assertRaises(RuntimeError):
+            PfsFiberProfiles.parseFilename("pfsArm-012345-r1.fits")
+
+    def testValidate(self):
+        """Test that validate catches profiles of the wrong width"""
+        profiles = list(self.profiles)
+        profiles[0] = self.profiles[0][:, :-1]
+        with self.assertRaises(AssertionError):
+            self.makeFiberProfiles(profiles=profiles)
+
+        rows = list(self.rows)
+        rows[3] = rows[3][:-1]
+        with self.assertRaises(AssertionError):
+            self.makeFiberProfiles(rows=rows)
+
+
+class TestMemory(lsst.utils.tests.MemoryTestCase):
+    pass
+
+
+def setup_module(module):
+    lsst.utils.tests.init()
+
+
+if __name__ == "__main__":
+    setup_module(sys.modules["__main__"])
+    unittest.main()